@@ -1,5 +1,33 @@
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
 import streamlit as st
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+from pandas.tseries.api import guess_datetime_format
+
+from chatbot import answer_for
+from kpis import (
+    DBT_ANOMALIES_MAX,
+    FRAUD_ACTIONS,
+    FRAUD_STATUS,
+    FRAUD_THRESHOLDS,
+    GHOST_PCT_MAX,
+    LEAKAGE_ACTIONS,
+    LEAKAGE_DEV_MAX,
+    LEAKAGE_STATUS,
+    LEAKAGE_THRESHOLDS,
+    compute_kpis,
+    risk_band,
+)
 
 # =========================
 # BASIC PAGE SETUP
@@ -24,47 +52,491 @@ NFSA_CSV_PATH = "NFSA_Date_Abstract.csv"
 SALE_CSV_PATH = "sale_dist.csv"
 SCHEME_CSV_PATH = "Scheme_Wise_Sale_Allotment_11_2025.csv"
 
+# Messages kept in the chatbot history (older ones drop off).
+CHAT_HISTORY_LIMIT = 50
+
+# Rows per page in the Raw Data Explorer; only the current page is sent
+# to the browser.
+EXPLORER_PAGE_ROWS = 500
+
+# Static Overview alert feed, sent to the page as a single markdown element.
+ALERT_FEED_MD = (
+    "- 🚨 Truck diversion suspected on Route VJA-123 (off-route by 12 km).\n"
+    "- ⚠️ 5,432 ghost cards flagged in last Aadhaar sync.\n"
+    "- 🚨 DBT burst pattern detected in Tirupati cluster (₹1.2 Cr risk).\n"
+    "- ✅ Quality checks cleared for latest FCI shipment to Visakhapatnam."
+)
+
 # =========================
 # HELPERS
 # =========================
-def load_csv(path: str) -> pd.DataFrame | None:
-    """Load a CSV safely; if missing, show a gentle info box and return None."""
+# load_tables() reads each dataset into a process-wide store shared by every
+# session (no hashing or copying per rerun), so callers of load_table() must
+# .copy() before mutating a frame. Files are re-read when their mtime moves;
+# a failed read is never stored, so it is simply retried on the next run.
+def load_csv(path: str) -> pd.DataFrame:
+    """
+    Parse a CSV with pyarrow's multi-threaded reader, wrapping the resulting
+    Arrow columns without converting them. pyarrow names the blank cells of
+    the multi-row report headers "", so the names are taken from pandas' own
+    header parse ("Unnamed: N", de-duplicated) instead. Raises if the file
+    can't be read.
+    """
+    table = pacsv.read_csv(
+        path, convert_options=pacsv.ConvertOptions(strings_can_be_null=True)
+    )
+    df = table.to_pandas(types_mapper=pd.ArrowDtype, self_destruct=True)
+    df.columns = pd.read_csv(path, nrows=0).columns
+    return df
+
+
+def parquet_path(csv_path: str) -> str:
+    """Path of the Parquet copy kept next to a CSV."""
+    return str(Path(csv_path).with_suffix(".parquet"))
+
+
+def fresh_parquet_path(csv_path: str) -> str | None:
+    """Parquet copy of a CSV, or None if it is missing or older than the CSV."""
+    path = Path(parquet_path(csv_path))
+    if not path.exists():
+        return None
+    csv = Path(csv_path)
+    if csv.exists() and csv.stat().st_mtime > path.stat().st_mtime:
+        return None
+    return str(path)
+
+
+def save_parquet(df: pd.DataFrame, path: str) -> None:
+    """
+    Write a Parquet copy for the next cold start. Best effort: on a
+    read-only deploy the app simply keeps parsing the CSV.
+    """
+    # A temp name unique to this writer, so concurrent writers (another
+    # server process, convert_to_parquet.py) never share a half-written file.
+    with tempfile.NamedTemporaryFile(
+        dir=Path(path).parent, prefix=Path(path).name + ".", suffix=".tmp", delete=False
+    ) as f:
+        tmp = Path(f.name)
     try:
-        return pd.read_csv(path)
-    except Exception as e:
-        st.info(f"Could not load '{path}': {e}")
+        df.to_parquet(tmp, engine="pyarrow", compression="snappy", index=False)
+        tmp.replace(path)
+    except Exception:
+        tmp.unlink(missing_ok=True)
+
+
+def load_parquet(path: str) -> pd.DataFrame | None:
+    """
+    Load a Parquet file into Arrow-backed columns (no per-column conversion
+    to NumPy/object); None if it isn't there.
+    """
+    if not Path(path).exists():
         return None
+    return pd.read_parquet(path, engine="pyarrow", dtype_backend="pyarrow")
+
+
+@st.cache_resource
+def open_parquet_dataset(path: str, mtime: float) -> ds.Dataset:
+    """
+    Lazily opened pyarrow dataset over a Parquet file, reopened whenever
+    the file's mtime changes. Reads through it touch only the row groups
+    and columns they need.
+    """
+    return ds.dataset(path, format="parquet")
+
+
+def parquet_dataset(csv_path: str) -> ds.Dataset | None:
+    """Dataset over the up-to-date, readable Parquet copy of a CSV; None (uncached) otherwise."""
+    path = fresh_parquet_path(csv_path)
+    if path is None:
+        return None
+    try:
+        return open_parquet_dataset(path, Path(path).stat().st_mtime)
+    except Exception:
+        # Unreadable copy: callers fall back to the loaded frame.
+        return None
+
+
+def categorize_strings(df: pd.DataFrame, max_ratio: float = 0.5) -> pd.DataFrame:
+    """
+    Store repetitive text columns (district, office, and the exports' text
+    numbers) as categories: one copy of each distinct value plus integer
+    codes, which also makes them cheap group keys.
+    """
+    cols = [
+        col for col in df.columns
+        if (pd.api.types.is_string_dtype(df[col].dtype) or df[col].dtype == object)
+        and df[col].nunique(dropna=False) <= max_ratio * len(df)
+    ]
+    return df.astype({col: "category" for col in cols}) if cols else df
+
+
+def source_mtime(csv_path: str) -> float | None:
+    """
+    mtime of a dataset's CSV, or of its Parquet copy when only that is
+    there; None if neither exists.
+    """
+    for path in (Path(csv_path), Path(parquet_path(csv_path))):
+        if path.exists():
+            return path.stat().st_mtime
+    return None
+
+
+def read_table(csv_path: str) -> pd.DataFrame:
+    """
+    Prefer an up-to-date Parquet copy of a CSV. Otherwise parse the CSV and
+    leave a Parquet copy behind so the next cold start can skip the parse.
+    """
+    path = fresh_parquet_path(csv_path)
+    df = None
+    if path is not None:
+        try:
+            df = load_parquet(path)
+        except Exception:
+            # Unreadable copy (truncated, foreign, ...): rebuild it from the CSV.
+            if not Path(csv_path).exists():
+                raise
+    if df is None:
+        df = load_csv(csv_path)
+        save_parquet(df, parquet_path(csv_path))
+    return categorize_strings(df)
+
+
+@st.cache_resource
+def table_store() -> tuple[dict[str, tuple[float | None, pd.DataFrame]], threading.Lock]:
+    """Loaded frames by CSV path with the mtime each was read at, and the lock guarding them."""
+    return {}, threading.Lock()
+
+
+def load_table(csv_path: str) -> pd.DataFrame | None:
+    """The loaded frame for a dataset, or None if it couldn't be read."""
+    tables, _ = table_store()
+    entry = tables.get(csv_path)
+    return entry[1] if entry is not None else None
+
+
+def read_or_error(csv_path: str) -> pd.DataFrame | Exception:
+    """read_table(), handing back the exception instead of raising it."""
+    try:
+        return read_table(csv_path)
+    except Exception as e:
+        return e
+
+
+def load_tables(csv_paths: list[str]) -> list[pd.DataFrame | None]:
+    """
+    (Re)read every dataset that is not loaded yet or whose file changed
+    since it was read, then return the frames in order. The reads run on a
+    thread pool so cold-start parses overlap (pandas/pyarrow release the
+    GIL while parsing); workers only parse, and results and st.info
+    messages are handled here on the script thread. Files that can't be
+    read get a gentle info box and None.
+    """
+    tables, lock = table_store()
+    changed = False
+    with lock:
+        stale = {}
+        for csv_path in csv_paths:
+            mtime = source_mtime(csv_path)
+            entry = tables.get(csv_path)
+            if entry is None or entry[0] != mtime:
+                stale[csv_path] = mtime
+        if stale:
+            with ThreadPoolExecutor(max_workers=len(stale)) as pool:
+                results = list(pool.map(read_or_error, stale))
+            for (csv_path, mtime), result in zip(stale.items(), results):
+                if isinstance(result, Exception):
+                    changed |= tables.pop(csv_path, None) is not None
+                    st.info(f"Could not load '{csv_path}': {result}")
+                else:
+                    tables[csv_path] = (mtime, result)
+                    changed = True
+    if changed:
+        clear_derived_caches()
+    return [load_table(csv_path) for csv_path in csv_paths]
+
+
+@st.cache_data
+def table_columns(csv_path: str) -> list[str]:
+    """Column names of a dataset, taken from the Parquet schema when possible."""
+    dset = parquet_dataset(csv_path)
+    if dset is not None:
+        return dset.schema.names
+    df = load_table(csv_path)
+    return df.columns.tolist() if df is not None else []
+
+
+@st.cache_data
+def preview_rows(csv_path: str, n: int) -> pd.DataFrame | None:
+    """First `n` rows of a dataset; from Parquet only the leading rows are read."""
+    dset = parquet_dataset(csv_path)
+    if dset is not None:
+        return dset.head(n).to_pandas()
+    df = load_table(csv_path)
+    return df.head(n) if df is not None else None
+
+
+# Strings that pd.to_numeric would accept once commas and padding are gone.
+NUMBER_PATTERN = r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$"
 
 
 def to_numeric(series: pd.Series) -> pd.Series:
     """Convert a column to numeric, safely (handles commas and junk)."""
+    dtype = series.dtype
+    if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+        return series
+    if isinstance(dtype, pd.CategoricalDtype):
+        if dtype.categories.empty:
+            # All-null column: no categories to coerce or index into.
+            return pd.Series(np.nan, index=series.index, name=series.name, dtype="float64")
+        # Coerce each distinct value once, then spread back out by code.
+        values = to_numeric(pd.Series(dtype.categories)).to_numpy("float64", na_value=np.nan)
+        codes = series.cat.codes.to_numpy()
+        return pd.Series(
+            np.where(codes >= 0, values[codes], np.nan), index=series.index, name=series.name
+        )
+    if isinstance(dtype, pd.ArrowDtype) and (
+        pa.types.is_string(dtype.pyarrow_dtype)
+        or pa.types.is_large_string(dtype.pyarrow_dtype)
+    ):
+        # Arrow-backed text: strip, validate and cast in pyarrow's kernels
+        # instead of round-tripping through Python str objects.
+        text = pc.utf8_trim_whitespace(
+            pc.replace_substring(pa.array(series), pattern=",", replacement="")
+        )
+        valid = pc.match_substring_regex(text, NUMBER_PATTERN)
+        nums = pc.cast(pc.if_else(valid, text, None), pa.float64())
+        return pd.Series(
+            nums, index=series.index, name=series.name, dtype=pd.ArrowDtype(pa.float64())
+        )
     return pd.to_numeric(
         series.astype(str).str.replace(",", "", regex=False),
         errors="coerce"
     )
 
 
-def numeric_columns(df: pd.DataFrame) -> list[str]:
+def guess_date_format(series: pd.Series, sample: int = 20) -> str | None:
+    """strftime format of the first recognisable date among the leading values."""
+    for value in series.dropna().astype(str).head(sample):
+        fmt = guess_datetime_format(value, dayfirst=True)
+        if fmt is not None:
+            return fmt
+    return None
+
+
+@st.cache_resource
+def parsed_dates(csv_path: str, date_col: str) -> pd.Series:
+    """
+    A dataset column parsed to datetimes once per column (NaT where a cell
+    isn't a date), shared like load_table() so switching the value column
+    doesn't re-parse it.
+    """
+    src = load_table(csv_path)[date_col]
+    return pd.to_datetime(src, format=guess_date_format(src), errors="coerce")
+
+
+@st.cache_data
+def nfsa_trend(csv_path: str, date_col: str, value_col: str) -> pd.Series:
     """
-    Return columns that can reasonably be treated as numeric
-    (after coercion, have at least 1 non-null numeric value).
+    Date-indexed numeric series for the NFSA trend chart, built from the
+    once-per-column date parse and numeric coercion.
     """
-    cols = []
-    for col in df.columns:
-        s = to_numeric(df[col])
-        if s.notna().sum() > 0:
-            cols.append(col)
-    return cols
+    tmp = pd.DataFrame({
+        date_col: parsed_dates(csv_path, date_col),
+        value_col: numeric_column(csv_path, value_col),
+    }).dropna()
+    return tmp.set_index(date_col)[value_col]
+
+
+@st.cache_resource
+def numeric_column(csv_path: str, col: str) -> pd.Series:
+    """
+    One dataset column coerced to numbers, once per (file, column) and
+    shared like load_table(). Only the columns a chart actually uses are
+    ever kept in memory.
+    """
+    return to_numeric(load_table(csv_path)[col])
+
+
+@st.cache_data
+def numeric_columns(csv_path: str) -> list[str]:
+    """
+    Columns that can reasonably be treated as numeric (at least one value
+    survives coercion). Each column is coerced and dropped in turn; only
+    the names are cached.
+    """
+    df = load_table(csv_path)
+    if df is None:
+        return []
+    return [col for col in df.columns if to_numeric(df[col]).notna().any()]
+
+
+@st.cache_data
+def dimension_columns(csv_path: str) -> list[str]:
+    """Columns with no numeric reading: the natural group-by keys."""
+    numeric = set(numeric_columns(csv_path))
+    return [col for col in table_columns(csv_path) if col not in numeric]
+
+
+def default_index(options: list[str], preferred: list[str]) -> int:
+    """Position of the first preferred option, falling back to the first."""
+    return next((options.index(col) for col in preferred if col in options), 0)
+
+
+def saved_plot(key: str, *options: list[str]) -> tuple[str, ...] | None:
+    """
+    Columns a Plot button saved under `key`, if each one is still among its
+    picker's current options; a choice that no longer fits is forgotten.
+    """
+    cols = st.session_state.get(key)
+    if cols is not None and all(col in opts for col, opts in zip(cols, options)):
+        return cols
+    st.session_state.pop(key, None)
+    return None
+
+
+@contextmanager
+def forget_plot_on_error(key: str):
+    """
+    Report a saved plot that fails to build or draw, and forget it so the
+    error shows once instead of on every later rerun.
+    """
+    try:
+        yield
+    except Exception as e:
+        st.session_state.pop(key, None)
+        st.error(f"Could not draw this chart: {e}")
+
+
+@st.cache_data
+def sale_by_group(csv_path: str, group_col: str, value_col: str) -> pd.Series:
+    """Summed value per group for the sale chart, largest first; cached per column pair."""
+    df = load_table(csv_path)
+    return (
+        numeric_column(csv_path, value_col)
+        .groupby(df[group_col], sort=False, observed=True)
+        .sum()
+        .sort_values(ascending=False)
+    )
+
+
+@st.cache_data
+def scheme_totals(
+    csv_path: str, scheme_col: str, allot_col: str, sale_col: str
+) -> pd.DataFrame:
+    """Allotment and sale summed per scheme; cached per column triple."""
+    df = load_table(csv_path)
+    values = pd.DataFrame({
+        col: numeric_column(csv_path, col) for col in dict.fromkeys([allot_col, sale_col])
+    })
+    return values.groupby(df[scheme_col], observed=True).sum()
+
+
+def chart_label(name: object) -> object:
+    """
+    Column name as a chart can take it: Altair reads "a:b" as field a with
+    encoding type b, so the exports' "Unnamed: N" names lose their colon.
+    """
+    return name.replace(":", "") if isinstance(name, str) else name
+
+
+def chart_ready(data: pd.Series | pd.DataFrame) -> pd.Series | pd.DataFrame:
+    """Copy of an aggregate with chart-safe series, column and index names."""
+    data = data.rename_axis(chart_label(data.index.name))
+    if isinstance(data, pd.Series):
+        return data.rename(chart_label(data.name))
+    return data.rename(columns=chart_label)
+
+
+@st.cache_data
+def make_trend_df(leakage_index: float, fraud_risk: float) -> pd.DataFrame:
+    """Six-month simulated risk trend for the Overview tab."""
+    return pd.DataFrame({
+        "Month": ["Apr", "May", "Jun", "Jul", "Aug", "Sep"],
+        "Leakage Index": [
+            40,
+            38,
+            35,
+            leakage_index + 2,
+            leakage_index,
+            max(leakage_index - 3, 10),
+        ],
+        "Fraud Risk": [
+            30,
+            28,
+            25,
+            fraud_risk + 3,
+            fraud_risk,
+            max(fraud_risk - 4, 5),
+        ],
+    }).set_index("Month")
+
+
+@st.cache_data
+def make_route_df(leakage_dev: int, leakage_index: float) -> pd.DataFrame:
+    """Route deviation vs alert score, with the current slider value last."""
+    return pd.DataFrame({
+        "Route Deviation (%)": [0, 5, 10, 15, 20, leakage_dev],
+        "Alert Score": [0, 10, 30, 50, 70, leakage_index],
+    })
+
+
+@st.cache_data
+def make_ghost_df(ghost_pct: int, ghost_loss: int) -> pd.DataFrame:
+    """Ghost % vs fiscal loss, with the current slider value last."""
+    return pd.DataFrame({
+        "Ghost %": list(range(0, 21, 5)) + [ghost_pct],
+        "Loss (₹ Cr)": [x * 3 for x in range(0, 21, 5)] + [ghost_loss],
+    })
+
+
+@st.cache_data
+def make_fraud_df(dbt_anomalies: int, fraud_risk: float) -> pd.DataFrame:
+    """DBT anomalies vs risk score, with the current slider value last."""
+    return pd.DataFrame({
+        "Anomalies per 10k txns": [0, 50, 100, 200, 300, dbt_anomalies],
+        "Risk Score": [0, 20, 40, 60, 80, fraud_risk],
+    })
+
+
+def clear_derived_caches() -> None:
+    """Drop everything computed from the loaded frames, after a (re)load."""
+    for cached in (
+        table_columns,
+        preview_rows,
+        parsed_dates,
+        nfsa_trend,
+        numeric_column,
+        numeric_columns,
+        dimension_columns,
+        sale_by_group,
+        scheme_totals,
+    ):
+        cached.clear()
 
 
 # =========================
 # LOAD DATA
 # =========================
-fps_df = load_csv(FPS_CSV_PATH)
-rc_df = load_csv(RC_CSV_PATH)
-nfsa_df = load_csv(NFSA_CSV_PATH)
-sale_df = load_csv(SALE_CSV_PATH)
-scheme_df = load_csv(SCHEME_CSV_PATH)
+fps_df, rc_df, nfsa_df, sale_df, scheme_df = load_tables([
+    FPS_CSV_PATH,
+    RC_CSV_PATH,
+    NFSA_CSV_PATH,
+    SALE_CSV_PATH,
+    SCHEME_CSV_PATH,
+])
+
+# Loaded datasets by Raw Data Explorer label; missing files are left out.
+DATASETS = {
+    label: df
+    for label, df in [
+        ("FPS CSV", fps_df),
+        ("RC CSV", rc_df),
+        ("NFSA CSV", nfsa_df),
+        ("Sale Dist CSV", sale_df),
+        ("Scheme-wise CSV", scheme_df),
+    ]
+    if df is not None
+}
 
 # =========================
 # SIDEBAR: SIMULATION CONTROLS
@@ -72,16 +544,16 @@ scheme_df = load_csv(SCHEME_CSV_PATH)
 st.sidebar.header("Simulation Controls")
 
 leakage_dev = st.sidebar.slider(
-    "Avg Truck Route Deviation (%)", 0, 50, 8
+    "Avg Truck Route Deviation (%)", 0, LEAKAGE_DEV_MAX, 8
 )
 ghost_pct = st.sidebar.slider(
-    "Ghost Beneficiaries (%)", 0, 20, 4
+    "Ghost Beneficiaries (%)", 0, GHOST_PCT_MAX, 4
 )
 fps_uptime = st.sidebar.slider(
     "FPS Uptime (%)", 60, 100, 92
 )
 dbt_anomalies = st.sidebar.slider(
-    "Unusual DBT Transactions (per 10k)", 0, 500, 90
+    "Unusual DBT Transactions (per 10k)", 0, DBT_ANOMALIES_MAX, 90
 )
 quality_level = st.sidebar.selectbox(
     "Grain Quality Status",
@@ -97,13 +569,8 @@ st.sidebar.caption(
 # =========================
 # SIMULATED KPIs
 # =========================
-leakage_index = round(leakage_dev * 1.5, 1)
-ghost_loss = ghost_pct * 3   # ₹ Cr (simulated)
-quality_score = 95 if quality_level == "Good" else (78 if quality_level == "Mixed" else 60)
-fraud_risk = round(dbt_anomalies / 5, 1)
-fiscal_savings = max(
-    0,
-    round(750 - (leakage_index + ghost_loss + (100 - quality_score) + fraud_risk), 1)
+leakage_index, ghost_loss, quality_score, fraud_risk, fiscal_savings = compute_kpis(
+    leakage_dev, ghost_pct, quality_level, dbt_anomalies
 )
 
 k1, k2, k3, k4, k5 = st.columns(5)
@@ -118,6 +585,11 @@ st.markdown("---")
 # =========================
 # TABS
 # =========================
+# Tabs with their own widgets draw them inside @st.fragment functions, so
+# using a widget in one tab reruns only that fragment, not the whole page.
+# Plot buttons store their column choice in session state, so a drawn chart
+# stays up across later reruns instead of vanishing with the button click;
+# a choice is dropped once it no longer fits the pickers or fails to draw.
 tabs = st.tabs([
     "Overview",
     "FPS (District-wise)",
@@ -143,62 +615,32 @@ with tabs[0]:
 
     with c1:
         st.markdown("#### Risk Trend (Simulated)")
-        trend_df = pd.DataFrame({
-            "Month": ["Apr", "May", "Jun", "Jul", "Aug", "Sep"],
-            "Leakage Index": [
-                40,
-                38,
-                35,
-                leakage_index + 2,
-                leakage_index,
-                max(leakage_index - 3, 10),
-            ],
-            "Fraud Risk": [
-                30,
-                28,
-                25,
-                fraud_risk + 3,
-                fraud_risk,
-                max(fraud_risk - 4, 5),
-            ],
-        }).set_index("Month")
-        st.line_chart(trend_df)
+        st.line_chart(make_trend_df(leakage_index, fraud_risk))
 
     with c2:
         st.markdown("#### Health Snapshot")
         st.progress(fps_uptime / 100.0)
         st.write(f"FPS Uptime: **{fps_uptime}%**")
 
-        if leakage_index > 50:
-            st.error("High Leakage Risk in Supply Chain")
-        elif leakage_index > 30:
-            st.warning("Moderate Leakage Risk – Watchlist")
-        else:
-            st.success("Leakage Under Control")
+        level, msg = LEAKAGE_STATUS[risk_band(leakage_index, LEAKAGE_THRESHOLDS)]
+        getattr(st, level)(msg)
 
-        if fraud_risk > 60:
-            st.error("DBT Fraud Risk is CRITICAL")
-        elif fraud_risk > 30:
-            st.warning("DBT Fraud Risk is ELEVATED")
-        else:
-            st.success("DBT Fraud Risk is NORMAL")
+        level, msg = FRAUD_STATUS[risk_band(fraud_risk, FRAUD_THRESHOLDS)]
+        getattr(st, level)(msg)
 
     st.markdown("#### AI Alert Feed (Simulated)")
-    st.write("- 🚨 Truck diversion suspected on Route VJA-123 (off-route by 12 km).")
-    st.write("- ⚠️ 5,432 ghost cards flagged in last Aadhaar sync.")
-    st.write("- 🚨 DBT burst pattern detected in Tirupati cluster (₹1.2 Cr risk).")
-    st.write("- ✅ Quality checks cleared for latest FCI shipment to Visakhapatnam.")
+    st.markdown(ALERT_FEED_MD)
 
     st.markdown("#### Real Data Snapshots (from CSVs)")
     if fps_df is not None:
         st.write("FPS CSV (first 10 rows):")
-        st.dataframe(fps_df.head(10), use_container_width=True)
+        st.dataframe(fps_df.head(10), use_container_width=True, hide_index=True)
     else:
         st.info("FPS CSV not loaded.")
 
     if rc_df is not None:
         st.write("RC CSV (first 10 rows):")
-        st.dataframe(rc_df.head(10), use_container_width=True)
+        st.dataframe(rc_df.head(10), use_container_width=True, hide_index=True)
     else:
         st.info("RC CSV not loaded.")
 
@@ -209,7 +651,7 @@ with tabs[1]:
     st.subheader("FPS District-wise View")
 
     if fps_df is not None:
-        st.dataframe(fps_df, use_container_width=True)
+        st.dataframe(fps_df, use_container_width=True, hide_index=True)
     else:
         st.warning("FPSReportDistrictWiseAsPerLatestRecord.csv not found.")
 
@@ -220,7 +662,7 @@ with tabs[2]:
     st.subheader("Ration Cards District-wise View")
 
     if rc_df is not None:
-        st.dataframe(rc_df, use_container_width=True)
+        st.dataframe(rc_df, use_container_width=True, hide_index=True)
     else:
         st.warning("RCReportDistrictWise.csv not found.")
 
@@ -234,21 +676,18 @@ with tabs[3]:
 
     with col_l1:
         st.markdown("##### Route Deviation vs Alert Level (Simulated)")
-        route_df = pd.DataFrame({
-            "Route Deviation (%)": [0, 5, 10, 15, 20, leakage_dev],
-            "Alert Score": [0, 10, 30, 50, 70, leakage_index],
-        })
+        route_df = make_route_df(leakage_dev, leakage_index)
         st.bar_chart(route_df, x="Route Deviation (%)", y="Alert Score")
 
     with col_l2:
         st.markdown("##### Sample Route Alert (Narrative)")
-        st.write("**Route ID:** MD-204")
-        st.write(f"**Deviation Detected:** {leakage_dev}%")
-        st.write(f"**AI Leakage Index:** {leakage_index}")
-        if leakage_index > 50:
-            st.error("Action: Freeze FPS withdrawals & alert Enforcement Cell.")
-        else:
-            st.info("Action: Monitor route & schedule surprise inspection.")
+        st.markdown(
+            "**Route ID:** MD-204\n\n"
+            f"**Deviation Detected:** {leakage_dev}%\n\n"
+            f"**AI Leakage Index:** {leakage_index}"
+        )
+        level, msg = LEAKAGE_ACTIONS[risk_band(leakage_index, LEAKAGE_THRESHOLDS)]
+        getattr(st, level)(msg)
 
 # =========================
 # TAB 5: GHOST BENEFICIARIES
@@ -260,16 +699,15 @@ with tabs[4]:
 
     with col_g1:
         st.markdown("##### Ghost % vs Fiscal Loss (Simulated)")
-        ghost_df = pd.DataFrame({
-            "Ghost %": list(range(0, 21, 5)) + [ghost_pct],
-            "Loss (₹ Cr)": [x * 3 for x in range(0, 21, 5)] + [ghost_loss],
-        })
+        ghost_df = make_ghost_df(ghost_pct, ghost_loss)
         st.area_chart(ghost_df, x="Ghost %", y="Loss (₹ Cr)")
 
     with col_g2:
         st.markdown("##### Cleanup Simulation")
-        st.write(f"Ghost Cards: **{ghost_pct}%**")
-        st.write(f"Estimated Loss: **₹{ghost_loss} Cr**")
+        st.markdown(
+            f"Ghost Cards: **{ghost_pct}%**\n\n"
+            f"Estimated Loss: **₹{ghost_loss} Cr**"
+        )
         st.success(
             f"Potential AI Cleanup Savings (~70%): **₹{round(ghost_loss * 0.7, 1)} Cr/year**"
         )
@@ -280,30 +718,32 @@ with tabs[4]:
 with tabs[5]:
     st.subheader("AI Module: Field Staff Tracking & FPS Monitoring")
 
-    visits_completed = int(fps_uptime / 5)
+    visits_completed = fps_uptime // 5
     visits_planned = 25
+    compliance_pct = visits_completed * 100 // visits_planned
 
     col_f1, col_f2 = st.columns(2)
 
     with col_f1:
         st.markdown("##### Inspector Visit Compliance (Simulated)")
         st.metric("Visits Completed", f"{visits_completed}", f"out of {visits_planned}")
-        st.metric(
-            "Compliance Rate",
-            f"{int((visits_completed / visits_planned) * 100)}%",
-        )
+        st.metric("Compliance Rate", f"{compliance_pct}%")
 
     with col_f2:
         st.markdown("##### Simple Visit Log (Demo)")
-        inspector_name = st.text_input("Inspector Name", "Ravi Kumar")
-        fps_code = st.text_input("FPS Code", "FPS-1039")
-        issue_flag = st.selectbox(
-            "Any Issue Observed?",
-            ["No Issue", "Stock Mismatch", "Device Offline", "Suspected Diversion"],
-        )
+        @st.fragment
+        def visit_log_form():
+            inspector_name = st.text_input("Inspector Name", "Ravi Kumar")
+            fps_code = st.text_input("FPS Code", "FPS-1039")
+            issue_flag = st.selectbox(
+                "Any Issue Observed?",
+                ["No Issue", "Stock Mismatch", "Device Offline", "Suspected Diversion"],
+            )
 
-        if st.button("Submit Visit Log (Simulated)"):
-            st.success(f"Visit recorded for {fps_code}. Issue: {issue_flag}")
+            if st.button("Submit Visit Log (Simulated)"):
+                st.success(f"Visit recorded for {fps_code}. Issue: {issue_flag}")
+
+        visit_log_form()
 
 # =========================
 # TAB 7: DBT FRAUD ANALYTICS
@@ -315,24 +755,19 @@ with tabs[6]:
 
     with col_d1:
         st.markdown("##### DBT Anomalies vs Risk Score (Simulated)")
-        fraud_df = pd.DataFrame({
-            "Anomalies per 10k txns": [0, 50, 100, 200, 300, dbt_anomalies],
-            "Risk Score": [0, 20, 40, 60, 80, fraud_risk],
-        })
+        fraud_df = make_fraud_df(dbt_anomalies, fraud_risk)
         st.line_chart(fraud_df, x="Anomalies per 10k txns", y="Risk Score")
 
     with col_d2:
         st.markdown("##### Sample Fraud Case (Simulated)")
-        st.write("**Scheme:** Rice Subsidy DBT")
-        st.write("**Beneficiary ID:** BEN-98234")
-        st.write("**Pattern:** Multiple withdrawals in 3 districts within 24 hours")
-        st.write(f"**Risk Score:** {fraud_risk}")
-        if fraud_risk > 60:
-            st.error("Action: AUTO-FREEZE payment & alert Audit Dept.")
-        elif fraud_risk > 30:
-            st.warning("Action: Send for manual review.")
-        else:
-            st.info("Action: Log only, no intervention.")
+        st.markdown(
+            "**Scheme:** Rice Subsidy DBT\n\n"
+            "**Beneficiary ID:** BEN-98234\n\n"
+            "**Pattern:** Multiple withdrawals in 3 districts within 24 hours\n\n"
+            f"**Risk Score:** {fraud_risk}"
+        )
+        level, msg = FRAUD_ACTIONS[risk_band(fraud_risk, FRAUD_THRESHOLDS)]
+        getattr(st, level)(msg)
 
 # =========================
 # TAB 8: AI CHATBOT
@@ -340,92 +775,38 @@ with tabs[6]:
 with tabs[7]:
     st.subheader("AI Assistant (Demo)")
 
-    if st.button("🗑️ Clear Chat History"):
-        st.session_state.chat_history = []
+    @st.fragment
+    def chat_panel():
+        if st.button("🗑️ Clear Chat History"):
+            st.session_state.chat_history = deque(maxlen=CHAT_HISTORY_LIMIT)
 
-    st.markdown(
-        "Ask questions about the Civil Supplies AI Command Centre, PDS leakages, "
-        "DBT fraud detection, or how this PoC works. "
-        "This is a simulated chatbot with prepared answers for the demo."
-    )
+        st.markdown(
+            "Ask questions about the Civil Supplies AI Command Centre, PDS leakages, "
+            "DBT fraud detection, or how this PoC works. "
+            "This is a simulated chatbot with prepared answers for the demo."
+        )
 
-    if "chat_history" not in st.session_state:
-        st.session_state.chat_history = []
+        if "chat_history" not in st.session_state:
+            st.session_state.chat_history = deque(maxlen=CHAT_HISTORY_LIMIT)
 
-    for role, msg in st.session_state.chat_history:
-        with st.chat_message(role):
-            st.write(msg)
+        for role, msg in st.session_state.chat_history:
+            with st.chat_message(role):
+                st.write(msg)
 
-    user_input = st.chat_input("Ask something about the Civil Supplies AI system...")
+        user_input = st.chat_input("Ask something about the Civil Supplies AI system...")
 
-    if user_input:
-        st.session_state.chat_history.append(("user", user_input))
-        with st.chat_message("user"):
-            st.write(user_input)
+        if user_input and not user_input.isspace():
+            st.session_state.chat_history.append(("user", user_input))
+            with st.chat_message("user"):
+                st.write(user_input)
 
-        q = user_input.lower()
+            answer = answer_for(user_input)
 
-        if "what is this" in q or "what does this system do" in q or "explain this" in q:
-            answer = (
-                "This system is a Proof of Concept for an AI-enabled Civil Supplies Command Centre. "
-                "It shows how data from AePDS, ePoS, DBT, FPS inspections and quality checks can be combined into one dashboard "
-                "so that leakages, ghost beneficiaries and fraud can be detected early and acted on."
-            )
-        elif "minister" in q or "ias" in q or "secretary" in q:
-            answer = (
-                "For the Minister and senior IAS officers, this dashboard gives a top-down view: key KPIs like leakage index, "
-                "ghost beneficiary loss, DBT fraud risk, FPS uptime and estimated savings. "
-                "They can quickly see which districts are healthy, which are at risk and what actions the system recommends."
-            )
-        elif "leakage" in q or "diversion" in q or "truck" in q or "route" in q:
-            answer = (
-                "Leakage is detected by monitoring truck GPS routes, stock movement and FPS withdrawals. "
-                "If a truck goes off its normal route or the stock issued at FPS does not match what was dispatched, "
-                "the AI raises a leakage alert with a risk score for that route or FPS."
-            )
-        elif "ghost" in q or "beneficiary" in q or "duplicate" in q:
-            answer = (
-                "Ghost beneficiaries are identified using Aadhaar deduplication, inactivity checks and cross-district pattern analysis. "
-                "The system looks for cards that are not used for many months, cards linked to the same Aadhaar or address, "
-                "and suspicious claims across multiple locations."
-            )
-        elif "dbt" in q or "fraud" in q or "payment" in q or "transaction" in q:
-            answer = (
-                "DBT fraud is detected by analysing transaction patterns. The system flags unusual withdrawal bursts, "
-                "multiple withdrawals from different locations for the same beneficiary and amounts that do not match typical behaviour. "
-                "High-risk cases can be auto-frozen or sent for audit."
-            )
-        elif "quality" in q or "grain" in q or "fci" in q or "warehouse" in q:
-            answer = (
-                "Grain quality is monitored using image-based inspection and simple IoT inputs from warehouses. "
-                "If colour, texture or moisture levels look abnormal, AI can flag a batch for manual inspection before it reaches beneficiaries."
-            )
-        elif "savings" in q or "money" in q or "roi" in q or "benefit" in q:
-            answer = (
-                "The PoC demonstrates how AI can reduce losses from leakage, ghost cards and fraud. "
-                "By acting on these alerts, the department can save a significant portion of recurring losses each year, "
-                "while improving reliability and trust in the PDS system."
-            )
-        elif "data" in q or "source" in q or "where does data come" in q:
-            answer = (
-                "In the real system, the data would come from AePDS, ePoS devices, DBT payment systems, GPS trackers and warehouse systems. "
-                "In this PoC, all risk scores are simulated to show the behaviour without using any real beneficiary data."
-            )
-        elif "implementation" in q or "how will this be implemented" in q or "next steps" in q:
-            answer = (
-                "This PoC is the first step. Once approved, the next phases would include connecting to real data sources via APIs, "
-                "fine-tuning AI models on Andhra Pradesh data and rolling out the dashboards in pilot districts before statewide scaling."
-            )
-        else:
-            answer = (
-                "This PoC chatbot is using prepared answers, not a live AI model. "
-                "In simple terms, the system is designed to reduce leakage, clean up beneficiary data, detect DBT fraud and improve FPS performance "
-                "using AI-driven analytics."
-            )
+            st.session_state.chat_history.append(("assistant", answer))
+            with st.chat_message("assistant"):
+                st.write(answer)
 
-        st.session_state.chat_history.append(("assistant", answer))
-        with st.chat_message("assistant"):
-            st.write(answer)
+    chat_panel()
 
 # =========================
 # TAB 9: NFSA DATE ABSTRACT (CSV)
@@ -433,34 +814,42 @@ with tabs[7]:
 with tabs[8]:
     st.subheader("NFSA Date-wise Abstract (from NFSA_Date_Abstract.csv)")
 
-    if nfsa_df is not None:
-        st.dataframe(nfsa_df.head(200), use_container_width=True)
+    @st.fragment
+    def nfsa_panel():
+        if nfsa_df is not None:
+            st.dataframe(preview_rows(NFSA_CSV_PATH, 200), use_container_width=True, hide_index=True)
 
-        date_col = st.selectbox(
-            "Select Date column:",
-            nfsa_df.columns.tolist()
-        )
+            all_cols = table_columns(NFSA_CSV_PATH)
+            date_col = st.selectbox(
+                "Select Date column:",
+                all_cols,
+                index=default_index(all_cols, dimension_columns(NFSA_CSV_PATH))
+            )
 
-        num_cols = numeric_columns(nfsa_df)
-        if not num_cols:
-            st.info("No numeric-like columns found in NFSA CSV for charting.")
+            num_cols = numeric_columns(NFSA_CSV_PATH)
+            if not num_cols:
+                st.info("No numeric-like columns found in NFSA CSV for charting.")
+            else:
+                value_col = st.selectbox(
+                    "Select Quantity / Value column:",
+                    num_cols
+                )
+
+                if st.button("Plot NFSA Trend"):
+                    st.session_state.nfsa_plot = (date_col, value_col)
+
+                plot = saved_plot("nfsa_plot", all_cols, num_cols)
+                if plot is not None:
+                    with forget_plot_on_error("nfsa_plot"):
+                        trend = nfsa_trend(NFSA_CSV_PATH, *plot)
+                        if not trend.empty:
+                            st.line_chart(chart_ready(trend))
+                        else:
+                            st.warning("No valid data to plot after cleaning.")
         else:
-            value_col = st.selectbox(
-                "Select Quantity / Value column:",
-                num_cols
-            )
+            st.info("NFSA_Date_Abstract.csv not found.")
 
-            if st.button("Plot NFSA Trend"):
-                tmp = nfsa_df[[date_col, value_col]].copy()
-                tmp[date_col] = pd.to_datetime(tmp[date_col], errors="coerce")
-                tmp[value_col] = to_numeric(tmp[value_col])
-                tmp = tmp.dropna()
-                if not tmp.empty:
-                    st.line_chart(tmp.set_index(date_col)[value_col])
-                else:
-                    st.warning("No valid data to plot after cleaning.")
-    else:
-        st.info("NFSA_Date_Abstract.csv not found.")
+    nfsa_panel()
 
 # =========================
 # TAB 10: SALE DISTRIBUTION (CSV)
@@ -468,37 +857,42 @@ with tabs[8]:
 with tabs[9]:
     st.subheader("Sale Distribution (from sale_dist.csv)")
 
-    if sale_df is not None:
-        st.dataframe(sale_df.head(200), use_container_width=True)
+    @st.fragment
+    def sale_panel():
+        if sale_df is not None:
+            st.dataframe(preview_rows(SALE_CSV_PATH, 200), use_container_width=True, hide_index=True)
 
-        group_col = st.selectbox(
-            "Group by column:",
-            sale_df.columns.tolist()
-        )
-
-        num_cols = numeric_columns(sale_df)
-        if not num_cols:
-            st.info("No numeric-like columns found in sale_dist CSV for charting.")
-        else:
-            value_col = st.selectbox(
-                "Value column (amount/qty):",
-                num_cols
+            all_cols = table_columns(SALE_CSV_PATH)
+            group_col = st.selectbox(
+                "Group by column:",
+                all_cols,
+                index=default_index(all_cols, dimension_columns(SALE_CSV_PATH))
             )
 
-            if st.button("Plot Sale Distribution"):
-                tmp = sale_df[[group_col, value_col]].copy()
-                tmp[value_col] = to_numeric(tmp[value_col])
-                agg = (
-                    tmp.groupby(group_col)[value_col]
-                    .sum()
-                    .sort_values(ascending=False)
+            num_cols = numeric_columns(SALE_CSV_PATH)
+            if not num_cols:
+                st.info("No numeric-like columns found in sale_dist CSV for charting.")
+            else:
+                value_col = st.selectbox(
+                    "Value column (amount/qty):",
+                    num_cols
                 )
-                if not agg.empty:
-                    st.bar_chart(agg)
-                else:
-                    st.warning("No numeric data to plot after aggregation.")
-    else:
-        st.info("sale_dist.csv not found.")
+
+                if st.button("Plot Sale Distribution"):
+                    st.session_state.sale_plot = (group_col, value_col)
+
+                plot = saved_plot("sale_plot", all_cols, num_cols)
+                if plot is not None:
+                    with forget_plot_on_error("sale_plot"):
+                        agg = sale_by_group(SALE_CSV_PATH, *plot)
+                        if not agg.empty:
+                            st.bar_chart(chart_ready(agg))
+                        else:
+                            st.warning("No numeric data to plot after aggregation.")
+        else:
+            st.info("sale_dist.csv not found.")
+
+    sale_panel()
 
 # =========================
 # TAB 11: SCHEME-WISE (CSV)
@@ -506,43 +900,52 @@ with tabs[9]:
 with tabs[10]:
     st.subheader("Scheme-wise Allotment vs Sale (from Scheme_Wise_Sale_Allotment_11_2025.csv)")
 
-    if scheme_df is not None:
-        st.dataframe(scheme_df.head(200), use_container_width=True)
-
-        scheme_col = st.selectbox(
-            "Scheme column:",
-            scheme_df.columns.tolist()
-        )
+    @st.fragment
+    def scheme_panel():
+        if scheme_df is not None:
+            st.dataframe(preview_rows(SCHEME_CSV_PATH, 200), use_container_width=True, hide_index=True)
 
-        num_cols = numeric_columns(scheme_df)
-        if len(num_cols) < 2:
-            st.info(
-                "Need at least two numeric-like columns (e.g., Allotment & Sale) "
-                "to plot a comparison chart."
+            all_cols = table_columns(SCHEME_CSV_PATH)
+            scheme_col = st.selectbox(
+                "Scheme column:",
+                all_cols,
+                index=default_index(all_cols, dimension_columns(SCHEME_CSV_PATH))
             )
+
+            num_cols = numeric_columns(SCHEME_CSV_PATH)
+            if len(num_cols) < 2:
+                st.info(
+                    "Need at least two numeric-like columns (e.g., Allotment & Sale) "
+                    "to plot a comparison chart."
+                )
+            else:
+                allot_col = st.selectbox(
+                    "Allotment column:",
+                    num_cols,
+                    key="scheme_allot"
+                )
+                sale_col = st.selectbox(
+                    "Sale column:",
+                    num_cols,
+                    index=1,
+                    key="scheme_sale"
+                )
+
+                if st.button("Plot Scheme-wise Allotment vs Sale"):
+                    st.session_state.scheme_plot = (scheme_col, allot_col, sale_col)
+
+                plot = saved_plot("scheme_plot", all_cols, num_cols, num_cols)
+                if plot is not None:
+                    with forget_plot_on_error("scheme_plot"):
+                        agg = scheme_totals(SCHEME_CSV_PATH, *plot)
+                        if not agg.empty:
+                            st.bar_chart(chart_ready(agg))
+                        else:
+                            st.warning("No numeric data to plot after aggregation.")
         else:
-            allot_col = st.selectbox(
-                "Allotment column:",
-                num_cols,
-                key="scheme_allot"
-            )
-            sale_col = st.selectbox(
-                "Sale column:",
-                num_cols,
-                key="scheme_sale"
-            )
+            st.info("Scheme_Wise_Sale_Allotment_11_2025.csv not found.")
 
-            if st.button("Plot Scheme-wise Allotment vs Sale"):
-                tmp = scheme_df[[scheme_col, allot_col, sale_col]].copy()
-                tmp[allot_col] = to_numeric(tmp[allot_col])
-                tmp[sale_col] = to_numeric(tmp[sale_col])
-                agg = tmp.groupby(scheme_col)[[allot_col, sale_col]].sum()
-                if not agg.empty:
-                    st.bar_chart(agg)
-                else:
-                    st.warning("No numeric data to plot after aggregation.")
-    else:
-        st.info("Scheme_Wise_Sale_Allotment_11_2025.csv not found.")
+    scheme_panel()
 
 # =========================
 # TAB 12: RAW DATA EXPLORER
@@ -550,20 +953,26 @@ with tabs[10]:
 with tabs[11]:
     st.subheader("Raw Data Explorer")
 
-    datasets = {}
-    if fps_df is not None:
-        datasets["FPS CSV"] = fps_df
-    if rc_df is not None:
-        datasets["RC CSV"] = rc_df
-    if nfsa_df is not None:
-        datasets["NFSA CSV"] = nfsa_df
-    if sale_df is not None:
-        datasets["Sale Dist CSV"] = sale_df
-    if scheme_df is not None:
-        datasets["Scheme-wise CSV"] = scheme_df
-
-    if not datasets:
-        st.warning("No datasets loaded. Check that CSV files exist next to app.py.")
-    else:
-        choice = st.selectbox("Select dataset:", list(datasets.keys()))
-        st.dataframe(datasets[choice], use_container_width=True)
+    @st.fragment
+    def explorer_panel():
+        if not DATASETS:
+            st.warning("No datasets loaded. Check that CSV files exist next to app.py.")
+        else:
+            choice = st.selectbox("Select dataset:", list(DATASETS))
+            df = DATASETS[choice]
+            n_pages = max(1, -(-len(df) // EXPLORER_PAGE_ROWS))
+            page = st.number_input(
+                f"Page (of {n_pages}, {EXPLORER_PAGE_ROWS} rows each):",
+                min_value=1,
+                max_value=n_pages,
+                value=1,
+                key=f"explorer_page_{choice}"
+            )
+            start = (page - 1) * EXPLORER_PAGE_ROWS
+            st.dataframe(
+                df.iloc[start:start + EXPLORER_PAGE_ROWS],
+                use_container_width=True,
+                hide_index=True
+            )
+
+    explorer_panel()
@@ -0,0 +1,107 @@
+"""Prepared answers for the demo chatbot and the keyword matcher that picks one."""
+import re
+from functools import lru_cache
+
+
+# (trigger phrases, answer) in priority order: the first topic with any of
+# its phrases inside the lower-cased question wins.
+TOPIC_ANSWERS = [
+    (
+        ("what is this", "what does this system do", "explain this"),
+        (
+            "This system is a Proof of Concept for an AI-enabled Civil Supplies Command Centre. "
+            "It shows how data from AePDS, ePoS, DBT, FPS inspections and quality checks can be combined into one dashboard "
+            "so that leakages, ghost beneficiaries and fraud can be detected early and acted on."
+        ),
+    ),
+    (
+        ("minister", "ias", "secretary"),
+        (
+            "For the Minister and senior IAS officers, this dashboard gives a top-down view: key KPIs like leakage index, "
+            "ghost beneficiary loss, DBT fraud risk, FPS uptime and estimated savings. "
+            "They can quickly see which districts are healthy, which are at risk and what actions the system recommends."
+        ),
+    ),
+    (
+        ("leakage", "diversion", "truck", "route"),
+        (
+            "Leakage is detected by monitoring truck GPS routes, stock movement and FPS withdrawals. "
+            "If a truck goes off its normal route or the stock issued at FPS does not match what was dispatched, "
+            "the AI raises a leakage alert with a risk score for that route or FPS."
+        ),
+    ),
+    (
+        ("ghost", "beneficiary", "duplicate"),
+        (
+            "Ghost beneficiaries are identified using Aadhaar deduplication, inactivity checks and cross-district pattern analysis. "
+            "The system looks for cards that are not used for many months, cards linked to the same Aadhaar or address, "
+            "and suspicious claims across multiple locations."
+        ),
+    ),
+    (
+        ("dbt", "fraud", "payment", "transaction"),
+        (
+            "DBT fraud is detected by analysing transaction patterns. The system flags unusual withdrawal bursts, "
+            "multiple withdrawals from different locations for the same beneficiary and amounts that do not match typical behaviour. "
+            "High-risk cases can be auto-frozen or sent for audit."
+        ),
+    ),
+    (
+        ("quality", "grain", "fci", "warehouse"),
+        (
+            "Grain quality is monitored using image-based inspection and simple IoT inputs from warehouses. "
+            "If colour, texture or moisture levels look abnormal, AI can flag a batch for manual inspection before it reaches beneficiaries."
+        ),
+    ),
+    (
+        ("savings", "money", "roi", "benefit"),
+        (
+            "The PoC demonstrates how AI can reduce losses from leakage, ghost cards and fraud. "
+            "By acting on these alerts, the department can save a significant portion of recurring losses each year, "
+            "while improving reliability and trust in the PDS system."
+        ),
+    ),
+    (
+        ("data", "source", "where does data come"),
+        (
+            "In the real system, the data would come from AePDS, ePoS devices, DBT payment systems, GPS trackers and warehouse systems. "
+            "In this PoC, all risk scores are simulated to show the behaviour without using any real beneficiary data."
+        ),
+    ),
+    (
+        ("implementation", "how will this be implemented", "next steps"),
+        (
+            "This PoC is the first step. Once approved, the next phases would include connecting to real data sources via APIs, "
+            "fine-tuning AI models on Andhra Pradesh data and rolling out the dashboards in pilot districts before statewide scaling."
+        ),
+    ),
+]
+
+DEFAULT_ANSWER = (
+    "This PoC chatbot is using prepared answers, not a live AI model. "
+    "In simple terms, the system is designed to reduce leakage, clean up beneficiary data, detect DBT fraud and improve FPS performance "
+    "using AI-driven analytics."
+)
+
+_PHRASE_TOPIC = {
+    phrase: i for i, (phrases, _) in enumerate(TOPIC_ANSWERS) for phrase in phrases
+}
+# A zero-width lookahead reports every phrase position in one pass over the
+# question. Phrases are listed in topic order, so the lowest topic index among
+# the hits is the same answer the old if/elif chain picked.
+_PHRASE_RE = re.compile(
+    "(?=(" + "|".join(re.escape(p) for phrases, _ in TOPIC_ANSWERS for p in phrases) + "))"
+)
+
+
+def answer_for(question: str) -> str:
+    """Pick the prepared answer for a free-text question."""
+    return _answer_for_lower(question.lower())
+
+
+@lru_cache(maxsize=1024)
+def _answer_for_lower(q: str) -> str:
+    topic = min(
+        (_PHRASE_TOPIC[m.group(1)] for m in _PHRASE_RE.finditer(q)), default=None
+    )
+    return DEFAULT_ANSWER if topic is None else TOPIC_ANSWERS[topic][1]
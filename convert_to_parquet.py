@@ -0,0 +1,66 @@
+"""
+One-off conversion of the source CSV exports to Parquet.
+
+Run this after refreshing the CSVs:
+
+    python convert_to_parquet.py [csv ...]
+
+app.py reads the .parquet copy next to each CSV when it is at least as new
+as the CSV, and otherwise parses the CSV and writes the copy itself, so
+this step is optional; it just moves the first parse off the app's cold
+start.
+
+Files are streamed in CHUNK_ROWS batches and written as successive row
+groups, so peak memory stays around one batch however large the export.
+Every column is stored as text, exactly as exported; app.py does its own
+numeric coercion. Output goes to a temporary file that only replaces the
+.parquet copy once the whole CSV has been written.
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+SOURCE_CSV_PATHS = [
+    "FPSReportDistrictWiseAsPerLatestRecord.csv",
+    "RCReportDistrictWise.csv",
+    "NFSA_Date_Abstract.csv",
+    "sale_dist.csv",
+    "Scheme_Wise_Sale_Allotment_11_2025.csv",
+]
+
+CHUNK_ROWS = 50_000
+
+
+def convert(csv_path: str) -> Path:
+    """Write `<name>.parquet` next to the CSV and return its path."""
+    out = Path(csv_path).with_suffix(".parquet")
+    # Unique per run, so a concurrent app write or second converter never
+    # shares the temp file.
+    with tempfile.NamedTemporaryFile(
+        dir=out.parent, prefix=out.name + ".", suffix=".tmp", delete=False
+    ) as f:
+        tmp = Path(f.name)
+    writer = None
+    try:
+        for chunk in pd.read_csv(csv_path, dtype="string", chunksize=CHUNK_ROWS):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp, table.schema, compression="snappy")
+            writer.write_table(table)
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    writer.close()
+    tmp.replace(out)
+    return out
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:] or SOURCE_CSV_PATHS:
+        print(f"{path} -> {convert(path)}")
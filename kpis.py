@@ -0,0 +1,104 @@
+"""Simulated KPI maths for the command centre (no Streamlit imports)."""
+from bisect import bisect_left
+from functools import lru_cache
+from typing import NamedTuple
+
+# Upper bounds of the integer sidebar sliders (all start at 0).
+LEAKAGE_DEV_MAX = 50
+GHOST_PCT_MAX = 20
+DBT_ANOMALIES_MAX = 500
+
+
+def leakage_index_for(leakage_dev: float) -> float:
+    """Leakage index for an average route deviation (%)."""
+    return round(leakage_dev * 1.5, 1)
+
+
+def ghost_loss_for(ghost_pct: float) -> float:
+    """Simulated loss (₹ Cr) for a ghost-card percentage."""
+    return ghost_pct * 3
+
+
+def fraud_risk_for(dbt_anomalies: float) -> float:
+    """DBT fraud risk score for unusual transactions per 10k."""
+    return round(dbt_anomalies / 5, 1)
+
+
+# Each KPI depends on a single slider, so it is tabulated once per process
+# over that slider's range and looked up on every rerun.
+LEAKAGE_INDEX_TABLE = tuple(leakage_index_for(d) for d in range(LEAKAGE_DEV_MAX + 1))
+GHOST_LOSS_TABLE = tuple(ghost_loss_for(g) for g in range(GHOST_PCT_MAX + 1))
+FRAUD_RISK_TABLE = tuple(fraud_risk_for(a) for a in range(DBT_ANOMALIES_MAX + 1))
+QUALITY_SCORES = {"Good": 95, "Mixed": 78}
+DEFAULT_QUALITY_SCORE = 60
+
+# Band edges: a value must be strictly above an edge to move up a band.
+LEAKAGE_THRESHOLDS = (30, 50)
+FRAUD_THRESHOLDS = (30, 60)
+
+# (Streamlit status element, message) for band 0 / 1 / 2.
+LEAKAGE_STATUS = (
+    ("success", "Leakage Under Control"),
+    ("warning", "Moderate Leakage Risk – Watchlist"),
+    ("error", "High Leakage Risk in Supply Chain"),
+)
+FRAUD_STATUS = (
+    ("success", "DBT Fraud Risk is NORMAL"),
+    ("warning", "DBT Fraud Risk is ELEVATED"),
+    ("error", "DBT Fraud Risk is CRITICAL"),
+)
+LEAKAGE_ACTIONS = (
+    ("info", "Action: Monitor route & schedule surprise inspection."),
+    ("info", "Action: Monitor route & schedule surprise inspection."),
+    ("error", "Action: Freeze FPS withdrawals & alert Enforcement Cell."),
+)
+FRAUD_ACTIONS = (
+    ("info", "Action: Log only, no intervention."),
+    ("warning", "Action: Send for manual review."),
+    ("error", "Action: AUTO-FREEZE payment & alert Audit Dept."),
+)
+
+
+def tabulated(table: tuple, formula, value: float) -> float:
+    """
+    Table entry for an integer slider value inside the table's range;
+    anything else (negative, past the slider max, fractional) goes through
+    the formula itself rather than wrapping or overrunning the table.
+    """
+    if isinstance(value, int) and 0 <= value < len(table):
+        return table[value]
+    return formula(value)
+
+
+class Kpis(NamedTuple):
+    leakage_index: float
+    ghost_loss: int            # ₹ Cr (simulated)
+    quality_score: int
+    fraud_risk: float
+    fiscal_savings: float      # ₹ Cr (simulated)
+
+
+# Memoised per slider combination; lives in this module (not app.py) so the
+# cache survives Streamlit's top-to-bottom reruns.
+@lru_cache(maxsize=4096)
+def compute_kpis(
+    leakage_dev: int,
+    ghost_pct: int,
+    quality_level: str,
+    dbt_anomalies: int,
+) -> Kpis:
+    """Turn the sidebar slider values into the five headline KPIs."""
+    leakage_index = tabulated(LEAKAGE_INDEX_TABLE, leakage_index_for, leakage_dev)
+    ghost_loss = tabulated(GHOST_LOSS_TABLE, ghost_loss_for, ghost_pct)
+    quality_score = QUALITY_SCORES.get(quality_level, DEFAULT_QUALITY_SCORE)
+    fraud_risk = tabulated(FRAUD_RISK_TABLE, fraud_risk_for, dbt_anomalies)
+    fiscal_savings = max(
+        0,
+        round(750 - (leakage_index + ghost_loss + (100 - quality_score) + fraud_risk), 1)
+    )
+    return Kpis(leakage_index, ghost_loss, quality_score, fraud_risk, fiscal_savings)
+
+
+def risk_band(value: float, thresholds: tuple[float, float]) -> int:
+    """0 = normal, 1 = elevated, 2 = high, via one bisect over the band edges."""
+    return bisect_left(thresholds, value)